@@ -0,0 +1,41 @@
+import json
+
+from alert_dispatcher import build_sink, dispatch_batch
+
+# Configuration - UPDATE THESE
+ALERT_TOPIC_ARN = ''  # SNS topic for digests (takes precedence)
+ALERT_WEBHOOK_URL = ''  # Webhook for digests if no topic is set
+ALERT_FILE_PATH = '/tmp/coaching-alerts.jsonl'  # Local fallback sink for testing
+
+sink = build_sink(ALERT_TOPIC_ARN, ALERT_WEBHOOK_URL, ALERT_FILE_PATH)
+
+# destination -> time of the last digest; kept while the container is warm.
+# Losing it on a cold start can only send a digest early, never lose alerts.
+last_sent = {}
+
+
+def lambda_handler(event, context):
+    """
+    Triggered by the coaching alerts SQS queue
+
+    The event source mapping's batching window does the coalescing: each
+    batch becomes one digest per agent/supervisor. Alerts for destinations
+    that are rate-limited, or whose digest failed to send, are returned as
+    batch item failures so SQS redelivers them after the visibility timeout.
+
+    Requires ReportBatchItemFailures on the event source mapping.
+    """
+    alerts = []
+    failures = []
+    for record in event.get('Records', []):
+        try:
+            alerts.append((record['messageId'], json.loads(record['body'])))
+        except (KeyError, ValueError) as e:
+            print(f"⚠️ Skipping malformed alert message: {str(e)}")
+
+    if alerts:
+        retry_ids = dispatch_batch(alerts, sink, last_sent)
+        failures = [{'itemIdentifier': alert_id} for alert_id in retry_ids]
+        print(f"✅ Dispatched {len(alerts) - len(retry_ids)} alerts, {len(retry_ids)} deferred")
+
+    return {'batchItemFailures': failures}
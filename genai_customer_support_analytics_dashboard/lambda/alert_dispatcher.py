@@ -0,0 +1,181 @@
+import json
+import threading
+import time
+import urllib.request
+from datetime import datetime
+
+# Configuration - UPDATE THESE
+# The coalescing window is the SQS event source mapping's batching window
+MIN_SEND_INTERVAL_SECONDS = 300  # At most one digest per destination per interval
+MAX_ALERTS_PER_DIGEST = 50  # Digests list the first N alerts and count the rest
+SNS_MAX_MESSAGE_BYTES = 256 * 1024
+SQS_BATCH_SIZE = 10  # SendMessageBatch limit
+SUPERVISOR_BY_AGENT = {}  # e.g. {'TestAgent': 'supervisor@example.com'}
+
+
+class FileSink:
+    """Append each digest as one JSON line to a local file (testing stand-in)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def send(self, digest):
+        with self.lock:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(digest, default=str) + '\n')
+
+
+class HttpSink:
+    """POST each digest as JSON to a webhook URL"""
+
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, digest):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(digest, default=str).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class SnsSink:
+    """Publish each digest to an SNS topic, trimmed to the SNS message size limit"""
+
+    def __init__(self, topic_arn, sns_client=None):
+        self.topic_arn = topic_arn
+        self.sns = sns_client
+
+    def send(self, digest):
+        if self.sns is None:
+            import boto3
+            self.sns = boto3.client('sns')
+        self.sns.publish(
+            TopicArn=self.topic_arn,
+            Subject=f"Coaching alerts: {digest['alertCount']} high-priority insight(s)"[:100],
+            Message=encode_digest(digest, SNS_MAX_MESSAGE_BYTES)
+        )
+
+
+class SqsAlertQueue:
+    """
+    Hands alerts off to an SQS queue for alert_digest_handler to coalesce
+
+    Used by the ingest Lambda: one SendMessageBatch per 10 alerts and no
+    state kept in the container, so nothing is lost when Lambda freezes or
+    recycles it. The caller supplies the client so it is created at import
+    time with short timeouts (see s3_trigger_coaching_handler).
+    """
+
+    def __init__(self, queue_url, sqs_client):
+        self.queue_url = queue_url
+        self.sqs = sqs_client
+
+    def submit(self, insights):
+        """Queue insights as alert messages; returns how many were accepted"""
+        accepted = 0
+        for i in range(0, len(insights), SQS_BATCH_SIZE):
+            batch = insights[i:i + SQS_BATCH_SIZE]
+            try:
+                response = self.sqs.send_message_batch(
+                    QueueUrl=self.queue_url,
+                    Entries=[
+                        {'Id': str(n), 'MessageBody': json.dumps(insight, default=str)}
+                        for n, insight in enumerate(batch)
+                    ]
+                )
+                accepted += len(response.get('Successful', []))
+                for failure in response.get('Failed', []):
+                    print(f"❌ Error queueing alert: {failure.get('Message', failure.get('Code'))}")
+            except Exception as e:
+                print(f"❌ Error queueing alerts: {str(e)}")
+        return accepted
+
+
+def destination_for(insight):
+    """Route an insight to the agent's supervisor if known, else to the agent"""
+    agent = insight.get('agentName', 'Unknown')
+    supervisor = SUPERVISOR_BY_AGENT.get(agent)
+    if supervisor:
+        return f"supervisor:{supervisor}"
+    return f"agent:{agent}"
+
+
+def build_digest(destination, alerts):
+    """Summarise a batch of high-priority insights for one destination"""
+    total = len(alerts)
+    listed = alerts[:MAX_ALERTS_PER_DIGEST]
+    return {
+        'destination': destination,
+        'alertCount': total,
+        'truncated': total - len(listed),
+        'agents': sorted({a.get('agentName', 'Unknown') for a in listed}),
+        'categories': sorted({a.get('category', 'unknown') for a in listed}),
+        'alerts': [
+            {
+                'id': a.get('id'),
+                'title': a.get('title'),
+                'priority': a.get('priority'),
+                'transcriptId': a.get('transcriptId'),
+                'callTime': a.get('callTime')
+            }
+            for a in listed
+        ],
+        'createdAt': datetime.now().isoformat()
+    }
+
+
+def encode_digest(digest, max_bytes):
+    """JSON-encode a digest, dropping listed alerts until it fits in max_bytes"""
+    message = json.dumps(digest, default=str)
+    alerts = digest['alerts']
+    while len(message.encode('utf-8')) > max_bytes and alerts:
+        alerts = alerts[:len(alerts) // 2]
+        trimmed = dict(digest, alerts=alerts, truncated=digest['alertCount'] - len(alerts))
+        message = json.dumps(trimmed, default=str)
+    return message
+
+
+def dispatch_batch(alerts, sink, last_sent, now=None, min_interval_seconds=None, route=destination_for):
+    """
+    Send one digest per destination for a batch of (alert_id, insight) pairs
+
+    Destinations still inside their minimum send interval, and digests the
+    sink fails to deliver, are not sent; their alert ids are returned so the
+    caller can retry them (e.g. as SQS batch item failures).
+    """
+    now = time.time() if now is None else now
+    if min_interval_seconds is None:
+        min_interval_seconds = MIN_SEND_INTERVAL_SECONDS
+    grouped = {}
+    for alert_id, insight in alerts:
+        grouped.setdefault(route(insight), []).append((alert_id, insight))
+
+    retry_ids = []
+    for destination, items in grouped.items():
+        ids = [alert_id for alert_id, _ in items]
+        last = last_sent.get(destination)
+        if last is not None and now - last < min_interval_seconds:
+            retry_ids.extend(ids)
+            continue
+        try:
+            sink.send(build_digest(destination, [insight for _, insight in items]))
+            last_sent[destination] = now
+        except Exception as e:
+            print(f"❌ Error sending alert digest to {destination}: {str(e)}")
+            retry_ids.extend(ids)
+    return retry_ids
+
+
+def build_sink(topic_arn='', webhook_url='', file_path='/tmp/coaching-alerts.jsonl'):
+    """Pick a sink from configuration: SNS topic, then webhook, then local file"""
+    if topic_arn:
+        return SnsSink(topic_arn)
+    if webhook_url:
+        return HttpSink(webhook_url)
+    return FileSink(file_path)
@@ -1,28 +1,34 @@
 import boto3
 import json
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from collections import defaultdict
 
+from transcript_partitions import list_window
+
 s3 = boto3.client('s3')
 
 # Configuration - UPDATE THESE VALUES
 BUCKET_NAME = 'pca-outputbucket-2h6ktepwp5th'  # Your S3 bucket name
 CACHE_DURATION_MINUTES = 15
+DEFAULT_WINDOW_HOURS = 24  # Time window analysed when the request doesn't specify one
+MAX_WINDOW_HOURS = 24 * 90
+MAX_TRANSCRIPTS = 100  # Limit for performance
+MAX_CACHED_WINDOWS = 16  # Distinct windowHours values cached at once
 
-# Global cache
-cache = {
-    'data': None,
-    'expiry': None
-}
+# Global cache: windowHours -> {'data': ..., 'expiry': ...}
+cache = {}
 
 def lambda_handler(event, context):
     """
     Main Lambda handler for coaching analytics endpoint
-    GET /coaching-analytics
+    GET /coaching-analytics?windowHours=24
     """
     try:
+        window_hours = get_window_hours(event)
+
         # Check cache first
-        if cache['data'] and cache['expiry'] and datetime.now() < cache['expiry']:
+        cached = get_cached_analytics(window_hours)
+        if cached is not None:
             print("✅ Returning cached analytics")
             return {
                 'statusCode': 200,
@@ -31,25 +37,24 @@ def lambda_handler(event, context):
                     'Access-Control-Allow-Origin': '*',
                     'Access-Control-Allow-Headers': 'Content-Type,Authorization',
                     'Access-Control-Allow-Methods': 'GET,OPTIONS',
-                    'Cache-Control': f'max-age={CACHE_DURATION_MINUTES * 60}'
+                    'Cache-Control': f'max-age={CACHE_DURATION_MINUTES * 60}',
+                    'X-Cache': 'HIT'
                 },
-                'body': json.dumps(cache['data'])
+                'body': json.dumps(cached)
             }
         
         print("🔄 Calculating fresh coaching analytics...")
         
-        # List all parsed transcript files
+        # List only the day partitions overlapping the requested window
+        window_end = datetime.now(timezone.utc)
+        window_start = window_end - timedelta(hours=window_hours)
         try:
-            response = s3.list_objects_v2(
-                Bucket=BUCKET_NAME,
-                Prefix='parsedFiles/',
-                MaxKeys=100  # Limit for performance
-            )
+            objects = list_window(s3, BUCKET_NAME, window_start, window_end)[:MAX_TRANSCRIPTS]
         except Exception as e:
             print(f"❌ Error listing S3 objects: {str(e)}")
             return error_response(f"Failed to access transcripts: {str(e)}")
         
-        if 'Contents' not in response:
+        if not objects:
             print("⚠️ No transcript files found")
             return success_response(get_empty_analytics())
         
@@ -59,7 +64,7 @@ def lambda_handler(event, context):
         agent_scores = defaultdict(list)
         total_transcripts = 0
         
-        for obj in response.get('Contents', []):
+        for obj in objects:
             if not obj['Key'].endswith('.json'):
                 continue
             
@@ -100,13 +105,13 @@ def lambda_handler(event, context):
             'coachingEffectiveness': calculate_effectiveness(all_insights),
             'insights': all_insights[:50],  # Return top 50 most recent
             'totalTranscripts': total_transcripts,
+            'windowHours': window_hours,
             'lastUpdated': datetime.now().isoformat(),
             'cacheExpiry': (datetime.now() + timedelta(minutes=CACHE_DURATION_MINUTES)).isoformat()
         }
         
         # Update cache
-        cache['data'] = analytics
-        cache['expiry'] = datetime.now() + timedelta(minutes=CACHE_DURATION_MINUTES)
+        store_cached_analytics(window_hours, analytics)
         
         return success_response(analytics)
         
@@ -115,6 +120,38 @@ def lambda_handler(event, context):
         return error_response(f"Internal error: {str(e)}")
 
 
+def get_cached_analytics(window_hours):
+    """Return cached analytics for a window if still fresh, else None"""
+    entry = cache.get(window_hours)
+    if entry and datetime.now() < entry['expiry']:
+        return entry['data']
+    return None
+
+
+def store_cached_analytics(window_hours, analytics):
+    """Cache analytics for a window, evicting expired then soonest-expiring entries"""
+    now = datetime.now()
+    for key in [k for k, entry in cache.items() if entry['expiry'] <= now]:
+        del cache[key]
+    while len(cache) >= MAX_CACHED_WINDOWS and window_hours not in cache:
+        del cache[min(cache, key=lambda k: cache[k]['expiry'])]
+
+    cache[window_hours] = {
+        'data': analytics,
+        'expiry': now + timedelta(minutes=CACHE_DURATION_MINUTES)
+    }
+
+
+def get_window_hours(event):
+    """Read the windowHours query parameter, falling back to the default window"""
+    params = (event or {}).get('queryStringParameters') or {}
+    try:
+        hours = int(params.get('windowHours', DEFAULT_WINDOW_HOURS))
+    except (TypeError, ValueError):
+        hours = DEFAULT_WINDOW_HOURS
+    return max(1, min(hours, MAX_WINDOW_HOURS))
+
+
 def generate_insights_from_transcript(transcript, file_key):
     """Generate coaching insights from a single transcript"""
     insights = []
@@ -390,7 +427,8 @@ def success_response(data):
             'Access-Control-Allow-Origin': '*',
             'Access-Control-Allow-Headers': 'Content-Type,Authorization',
             'Access-Control-Allow-Methods': 'GET,OPTIONS',
-            'Cache-Control': f'max-age={CACHE_DURATION_MINUTES * 60}'
+            'Cache-Control': f'max-age={CACHE_DURATION_MINUTES * 60}',
+            'X-Cache': 'MISS'
         },
         'body': json.dumps(data, default=str)
     }
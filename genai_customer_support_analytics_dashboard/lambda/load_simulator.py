@@ -0,0 +1,753 @@
+"""
+End-to-end load simulator for the coaching Lambdas
+
+Replays API Gateway GET /coaching-analytics events from many concurrent
+dashboard clients while PCA-style transcripts arrive at a configurable rate
+and drive the S3-triggered insight processor. Both handlers run in-process
+against local S3/DynamoDB stand-ins, so no AWS account is needed.
+
+Analytics requests are served by a pool of simulated Lambda containers. Each
+container loads its own copy of the handler module, so it has its own cold
+cache, and it serves one request at a time. A request goes to a free warm
+container, or to a new container when none is free (up to --containers).
+
+Usage:
+    python load_simulator.py --clients 200 --duration 30 --arrival-rate 5 \\
+        --window-hours 1:0.5,24:0.3,168:0.2 --legacy-flat-keys 500 \\
+        --slo-p95-ms 250 --slo-p99-ms 1000 --slo-min-hit-ratio 0.9 --slo-ingest-p99-ms 500
+
+Ingest invocations are reported separately as analysis, flat-key copy only,
+and backfill copy skipped; --slo-ingest-* applies to analysis invocations.
+
+With --alerts the scenario runs twice, with alerting off and then on. With
+alerting on, the trigger hands alerts to a local SQS stand-in through the
+real SqsAlertQueue, and alert_digest_handler consumes the queue in batches
+with a FileSink. Ingest latency and SQS calls are reported both ways.
+
+Exits with status 1 when any configured SLO threshold is exceeded.
+"""
+import argparse
+import contextlib
+import copy
+import importlib.util
+import io
+import json
+import math
+import os
+import queue
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import alert_digest_handler
+import alert_dispatcher
+import coaching_analytics_handler
+import s3_trigger_coaching_handler
+from alert_dispatcher import FileSink, SqsAlertQueue
+from transcript_partitions import backfill_partitions, is_backfill_copy, is_flat_key, partition_prefix
+
+BUCKET = 'pca-outputbucket-loadtest'
+HANDLER_PATH = coaching_analytics_handler.__file__
+PAGE_SIZE = 1000
+
+
+class CallCounter:
+    """Counts stand-in API calls per thread (one request at a time) and overall"""
+
+    def __init__(self):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.totals = defaultdict(int)
+
+    def current(self):
+        return getattr(self.local, 'counts', None)
+
+    def record(self, service, operation, counts=None):
+        name = f"{service}.{operation}"
+        counts = counts if counts is not None else self.current()
+        if counts is not None:
+            counts[name] += 1
+        with self.lock:
+            self.totals[name] += 1
+
+    @contextlib.contextmanager
+    def request(self):
+        """Collect the calls made by the current thread inside the block"""
+        self.local.counts = defaultdict(int)
+        try:
+            yield self.local.counts
+        finally:
+            self.local.counts = None
+
+
+class LocalBody:
+    def __init__(self, data):
+        self.data = data
+
+    def read(self):
+        return self.data
+
+
+class LocalPaginator:
+    def __init__(self, s3):
+        self.s3 = s3
+
+    def paginate(self, Bucket, Prefix='', Delimiter=None, **kwargs):
+        token = None
+        while True:
+            page = self.s3.list_objects_v2(
+                Bucket=Bucket, Prefix=Prefix, Delimiter=Delimiter, ContinuationToken=token
+            )
+            yield page
+            token = page.get('NextContinuationToken')
+            if not token:
+                return
+
+
+class LocalS3:
+    """
+    In-memory S3 stand-in for the calls the handlers make
+
+    Every object create is pushed onto `events` as an S3 notification record,
+    mirroring the bucket's parsedFiles/ trigger.
+    """
+
+    def __init__(self, counter, latency_ms=0.0):
+        self.counter = counter
+        self.latency = latency_ms / 1000.0
+        self.objects = {}  # key -> (bytes, LastModified, Metadata)
+        self.lock = threading.Lock()
+        self.events = queue.Queue()
+        self.pinned_counts = None
+
+    def pinned(self, counts):
+        """A view of the same bucket that charges calls to `counts` from any thread"""
+        view = copy.copy(self)
+        view.pinned_counts = counts
+        return view
+
+    def call(self, operation):
+        self.counter.record('s3', operation, self.pinned_counts)
+        if self.latency:
+            time.sleep(self.latency)
+
+    def store(self, key, data, last_modified=None, notify=True, metadata=None):
+        last_modified = last_modified or datetime.now(timezone.utc)
+        with self.lock:
+            self.objects[key] = (data, last_modified, dict(metadata or {}))
+        if notify:
+            self.events.put({
+                'eventTime': last_modified.isoformat(),
+                's3': {'bucket': {'name': BUCKET}, 'object': {'key': key}}
+            })
+
+    def get_paginator(self, operation):
+        return LocalPaginator(self)
+
+    def list_objects_v2(self, Bucket, Prefix='', Delimiter=None, ContinuationToken=None, MaxKeys=PAGE_SIZE):
+        self.call('ListObjectsV2')
+        with self.lock:
+            keys = sorted(k for k in self.objects if k.startswith(Prefix))
+            if Delimiter:
+                keys = [k for k in keys if Delimiter not in k[len(Prefix):]]
+            start = int(ContinuationToken or 0)
+            page_keys = keys[start:start + MaxKeys]
+            contents = [{'Key': k, 'LastModified': self.objects[k][1], 'Size': len(self.objects[k][0])}
+                        for k in page_keys]
+
+        page = {'KeyCount': len(contents)}
+        if contents:
+            page['Contents'] = contents
+        if start + MaxKeys < len(keys):
+            page['NextContinuationToken'] = str(start + MaxKeys)
+        return page
+
+    def metadata(self, key):
+        """Object metadata without counting an API call (for routing samples)"""
+        with self.lock:
+            return dict(self.objects[key][2]) if key in self.objects else {}
+
+    def get_object(self, Bucket, Key):
+        self.call('GetObject')
+        with self.lock:
+            data, last_modified, metadata = self.objects[Key]
+        return {'Body': LocalBody(data), 'LastModified': last_modified, 'Metadata': dict(metadata)}
+
+    def put_object(self, Bucket, Key, Body, Metadata=None, **kwargs):
+        self.call('PutObject')
+        self.store(Key, Body if isinstance(Body, bytes) else Body.encode('utf-8'), metadata=Metadata)
+
+    def copy_object(self, Bucket, Key, CopySource, Metadata=None, MetadataDirective='COPY', **kwargs):
+        self.call('CopyObject')
+        with self.lock:
+            data, _, source_metadata = self.objects[CopySource['Key']]
+        self.store(Key, data, metadata=Metadata if MetadataDirective == 'REPLACE' else source_metadata)
+
+
+class LocalTable:
+    def __init__(self, name, counter, latency):
+        self.name = name
+        self.counter = counter
+        self.latency = latency
+        self.items = {}
+        self.lock = threading.Lock()
+
+    def put_item(self, Item):
+        self.counter.record('dynamodb', 'PutItem')
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            self.items[Item['id']] = Item
+
+
+class LocalDynamoDB:
+    """In-memory stand-in for boto3.resource('dynamodb')"""
+
+    def __init__(self, counter, latency_ms=0.0):
+        self.counter = counter
+        self.latency = latency_ms / 1000.0
+        self.tables = {}
+        self.lock = threading.Lock()
+
+    def Table(self, name):
+        with self.lock:
+            if name not in self.tables:
+                self.tables[name] = LocalTable(name, self.counter, self.latency)
+            return self.tables[name]
+
+
+class LocalSqs:
+    """
+    In-memory SQS queue stand-in
+
+    send_message_batch is what the ingest Lambda calls. receive() and retry()
+    emulate the Lambda event source mapping that feeds alert_digest_handler.
+    """
+
+    def __init__(self, counter, latency_ms=0.0, visibility_timeout=5.0):
+        self.counter = counter
+        self.latency = latency_ms / 1000.0
+        self.visibility_timeout = visibility_timeout
+        self.messages = []  # [(visible_at, message_id, body)]
+        self.lock = threading.Lock()
+        self.next_id = 0
+        self.sent = 0
+
+    def send_message_batch(self, QueueUrl, Entries):
+        self.counter.record('sqs', 'SendMessageBatch')
+        if self.latency:
+            time.sleep(self.latency)
+        now = time.monotonic()
+        with self.lock:
+            for entry in Entries:
+                self.next_id += 1
+                self.messages.append((now, str(self.next_id), entry['MessageBody']))
+            self.sent += len(Entries)
+        return {'Successful': [{'Id': entry['Id']} for entry in Entries], 'Failed': []}
+
+    def receive(self, max_messages=1000):
+        """Take visible messages as SQS event records"""
+        now = time.monotonic()
+        with self.lock:
+            visible = [m for m in self.messages if m[0] <= now][:max_messages]
+            taken = {m[1] for m in visible}
+            self.messages = [m for m in self.messages if m[1] not in taken]
+        return [{'messageId': message_id, 'body': body} for _, message_id, body in visible]
+
+    def retry(self, records, failed_ids):
+        """Make batch item failures visible again after the visibility timeout"""
+        failed = set(failed_ids)
+        visible_at = time.monotonic() + self.visibility_timeout
+        with self.lock:
+            self.messages.extend(
+                (visible_at, r['messageId'], r['body']) for r in records if r['messageId'] in failed
+            )
+
+
+class CountingSink:
+    """Wraps a sink and counts delivered digests"""
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.digests = 0
+        self.alerts = 0
+
+    def send(self, digest):
+        self.sink.send(digest)
+        self.digests += 1
+        self.alerts += digest['alertCount']
+
+
+class Container:
+    """One Lambda execution environment with its own copy of the analytics handler"""
+
+    def __init__(self, number, s3, counter, cache_minutes):
+        spec = importlib.util.spec_from_file_location(f"coaching_analytics_handler_{number}", HANDLER_PATH)
+        handler = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(handler)
+
+        list_window = handler.list_window
+        handler.s3 = s3
+        # Partition listing runs on a thread pool; charge those calls to the calling request
+        handler.list_window = lambda client, *a, **kw: list_window(client.pinned(counter.current()), *a, **kw)
+        handler.BUCKET_NAME = BUCKET
+        handler.CACHE_DURATION_MINUTES = cache_minutes
+        self.handler = handler
+
+
+class ContainerPool:
+    """
+    Routes each request to a free warm container, creating one when none is free
+
+    With max_containers set, requests wait for a container once the limit is
+    reached, like a function with reserved concurrency.
+    """
+
+    def __init__(self, factory, max_containers=None):
+        self.factory = factory
+        self.max_containers = max_containers
+        self.free = []
+        self.created = 0
+        self.condition = threading.Condition()
+        # boto3's default session is not safe for concurrent client creation
+        self.init_lock = threading.Lock()
+
+    def acquire(self):
+        """Return (container, cold) for the next request"""
+        with self.condition:
+            while not self.free and self.max_containers and self.created >= self.max_containers:
+                self.condition.wait()
+            if self.free:
+                return self.free.pop(), False
+            self.created += 1
+            number = self.created
+
+        with self.init_lock:
+            return self.factory(number), True
+
+    def release(self, container):
+        with self.condition:
+            self.free.append(container)
+            self.condition.notify()
+
+
+def make_transcript(rng, agent):
+    """Build a PCA-style transcript readable by both handlers"""
+    customer_score = rng.uniform(-5, 5)
+    agent_secs = rng.randint(30, 300)
+    customer_secs = rng.randint(30, 300)
+    segments = []
+    t = 0.0
+    for i in range(rng.randint(6, 20)):
+        speaker = 'spk_1' if i % 2 else 'spk_0'
+        length = rng.uniform(2, 15)
+        sentiment = rng.choice(['positive', 'neutral', 'negative'])
+        segments.append({
+            'speaker': speaker,
+            'SegmentSpeaker': speaker,
+            'SegmentStartTime': round(t, 2),
+            'SegmentEndTime': round(t + length, 2),
+            'sentiment': sentiment
+        })
+        t += length + rng.uniform(-0.5, 2)
+
+    return {
+        'agentId': agent,
+        'ConversationAnalytics': {
+            'Agent': agent,
+            'Duration': round(t, 1),
+            'ConversationTime': datetime.now(timezone.utc).isoformat(),
+            'SentimentTrends': {
+                'spk_0': {'SentimentScore': round(customer_score, 2)},
+                'spk_1': {'SentimentScore': round(rng.uniform(-2, 5), 2)}
+            },
+            'SpeakerTime': {
+                'spk_0': {'TotalTimeSecs': customer_secs},
+                'spk_1': {'TotalTimeSecs': agent_secs}
+            },
+            'IssuesDetected': [{'Text': 'billing dispute'}] if rng.random() < 0.2 else []
+        },
+        'SpeechSegments': segments
+    }
+
+
+def seed_history(s3, rng, days, per_day, agents):
+    """Preload day partitions with historical transcripts (no trigger events)"""
+    now = datetime.now(timezone.utc)
+    for d in range(days):
+        day = now - timedelta(days=d)
+        for n in range(per_day):
+            key = f"{partition_prefix(day)}seed-{d}-{n}.json"
+            body = json.dumps(make_transcript(rng, rng.choice(agents))).encode('utf-8')
+            s3.store(key, body, last_modified=day, notify=False)
+
+
+def seed_flat_keys(s3, rng, count, days, agents):
+    """Preload legacy flat parsedFiles/*.json keys for backfill_partitions to migrate"""
+    now = datetime.now(timezone.utc)
+    for n in range(count):
+        modified = now - timedelta(days=rng.randrange(max(1, days)), hours=rng.uniform(0, 24))
+        body = json.dumps(make_transcript(rng, rng.choice(agents))).encode('utf-8')
+        s3.store(f"parsedFiles/legacy-{n}.json", body, last_modified=modified, notify=False)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Results:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)  # workload -> [(latency_ms, ok, calls, cache_hit, cold)]
+
+    def add(self, workload, latency_ms, ok, calls, cache_hit=False, cold=False):
+        with self.lock:
+            self.samples[workload].append((latency_ms, ok, dict(calls), cache_hit, cold))
+
+
+def parse_windows(spec):
+    """Parse '24' or '1:0.5,24:0.3,168:0.2' into (hours, weights)"""
+    hours, weights = [], []
+    for part in spec.split(','):
+        value, _, weight = part.strip().partition(':')
+        hours.append(int(value))
+        weights.append(float(weight) if weight else 1.0)
+    return hours, weights
+
+
+def dashboard_client(stop, pool, counter, results, windows, think_ms, rng_seed):
+    """One dashboard user polling GET /coaching-analytics until stopped"""
+    rng = random.Random(rng_seed)
+    hours, weights = windows
+    while not stop.is_set():
+        event = {
+            'httpMethod': 'GET',
+            'path': '/coaching-analytics',
+            'headers': {'Authorization': 'Bearer load-test'},
+            'queryStringParameters': {'windowHours': str(rng.choices(hours, weights)[0])}
+        }
+        with counter.request() as calls:
+            start = time.perf_counter()
+            container, cold = pool.acquire()
+            try:
+                response = container.handler.lambda_handler(event, None)
+                ok = response.get('statusCode') == 200
+                cache_hit = response.get('headers', {}).get('X-Cache') == 'HIT'
+            except Exception:
+                ok, cache_hit = False, False
+            finally:
+                pool.release(container)
+            latency_ms = (time.perf_counter() - start) * 1000
+        results.add('analytics', latency_ms, ok, calls, cache_hit, cold)
+        if think_ms:
+            time.sleep(rng.expovariate(1000.0 / think_ms))
+
+
+def pca_writer(stop, s3, arrival_rate, agents, rng_seed):
+    """Write flat PCA transcripts with Poisson arrivals at `arrival_rate` per second"""
+    rng = random.Random(rng_seed)
+    n = 0
+    while not stop.is_set():
+        stop.wait(rng.expovariate(arrival_rate))
+        if stop.is_set():
+            return
+        body = json.dumps(make_transcript(rng, rng.choice(agents))).encode('utf-8')
+        s3.store(f"parsedFiles/load-{rng_seed}-{n}.json", body)
+        n += 1
+
+
+def ingest_workload(s3, key):
+    """Classify a trigger invocation: flat-key copy, backfill skip, or analysis"""
+    if is_flat_key(key):
+        return 'ingestCopy'
+    if is_backfill_copy({'Metadata': s3.metadata(key)}):
+        return 'ingestBackfillSkip'
+    return 'ingest'
+
+
+def ingest_worker(stop, s3, counter, results):
+    """Deliver S3 notifications to the trigger handler, one record per invocation"""
+    while not (stop.is_set() and s3.events.empty()):
+        try:
+            record = s3.events.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        workload = ingest_workload(s3, record['s3']['object']['key'])
+        with counter.request() as calls:
+            start = time.perf_counter()
+            try:
+                response = s3_trigger_coaching_handler.lambda_handler({'Records': [record]}, None)
+                ok = response.get('statusCode') == 200
+            except Exception:
+                ok = False
+            latency_ms = (time.perf_counter() - start) * 1000
+        results.add(workload, latency_ms, ok, calls)
+
+
+def alert_consumer(stop, sqs, counter, results, batch_window):
+    """Feed queued alerts to alert_digest_handler once per batching window"""
+    while True:
+        stopping = stop.wait(batch_window)
+        records = sqs.receive()
+        if records:
+            with counter.request() as calls:
+                start = time.perf_counter()
+                try:
+                    response = alert_digest_handler.lambda_handler({'Records': records}, None)
+                    failed_ids = [f['itemIdentifier'] for f in response.get('batchItemFailures', [])]
+                    ok = True
+                except Exception:
+                    failed_ids, ok = [r['messageId'] for r in records], False
+                latency_ms = (time.perf_counter() - start) * 1000
+            sqs.retry(records, failed_ids)
+            results.add('alertDigest', latency_ms, ok, calls)
+        if stopping:
+            return
+
+
+def summarise(samples):
+    """Latency percentiles, error rate, cache hit ratio and calls per request"""
+    latencies = [s[0] for s in samples]
+    errors = sum(1 for s in samples if not s[1])
+    cache_hits = sum(1 for s in samples if s[3])
+    cold_starts = sum(1 for s in samples if s[4])
+    call_totals = defaultdict(int)
+    for _, _, calls, _, _ in samples:
+        for name, count in calls.items():
+            call_totals[name] += count
+
+    count = len(samples)
+    return {
+        'requests': count,
+        'errorRate': round(errors / count, 4) if count else 0.0,
+        'p50Ms': round(percentile(latencies, 50), 2),
+        'p95Ms': round(percentile(latencies, 95), 2),
+        'p99Ms': round(percentile(latencies, 99), 2),
+        'maxMs': round(max(latencies), 2) if latencies else 0.0,
+        'cacheHitRatio': round(cache_hits / count, 4) if count else 0.0,
+        'coldStarts': cold_starts,
+        'callsPerRequest': {
+            name: round(total / count, 3) for name, total in sorted(call_totals.items())
+        }
+    }
+
+
+def check_slos(report, args):
+    """Return a list of human-readable SLO violations"""
+    analytics = report['analytics']
+    violations = []
+    checks = [
+        ('analytics', 'p50Ms', args.slo_p50_ms, 'max'),
+        ('analytics', 'p95Ms', args.slo_p95_ms, 'max'),
+        ('analytics', 'p99Ms', args.slo_p99_ms, 'max'),
+        ('analytics', 'errorRate', args.slo_max_error_rate, 'max'),
+        ('analytics', 'cacheHitRatio', args.slo_min_hit_ratio, 'min'),
+        ('ingest', 'p95Ms', args.slo_ingest_p95_ms, 'max'),
+        ('ingest', 'p99Ms', args.slo_ingest_p99_ms, 'max'),
+        ('ingest', 'errorRate', args.slo_ingest_max_error_rate, 'max')
+    ]
+    for workload, metric, threshold, kind in checks:
+        if threshold is None or not report[workload]['requests']:
+            continue
+        value = report[workload][metric]
+        if (kind == 'max' and value > threshold) or (kind == 'min' and value < threshold):
+            violations.append(f"{workload} {metric}={value} {'>' if kind == 'max' else '<'} {threshold}")
+
+    s3_calls = sum(v for k, v in analytics['callsPerRequest'].items() if k.startswith('s3.'))
+    if args.slo_max_s3_calls is not None and s3_calls > args.slo_max_s3_calls:
+        violations.append(f"analytics S3 calls/request={s3_calls:.3f} > {args.slo_max_s3_calls}")
+    return violations
+
+
+def run(args, alerts=False):
+    rng = random.Random(args.seed)
+    counter = CallCounter()
+    s3 = LocalS3(counter, latency_ms=args.s3_latency_ms)
+    dynamodb = LocalDynamoDB(counter, latency_ms=args.dynamodb_latency_ms)
+    agents = [f"agent-{i:03d}" for i in range(args.agents)]
+
+    pool = ContainerPool(
+        lambda number: Container(number, s3, counter, args.cache_minutes),
+        max_containers=args.containers
+    )
+    s3_trigger_coaching_handler.s3 = s3
+    s3_trigger_coaching_handler.dynamodb = dynamodb
+    sqs = LocalSqs(counter, latency_ms=args.sqs_latency_ms, visibility_timeout=args.alert_min_interval)
+    sink = CountingSink(FileSink(args.alerts_file))
+    s3_trigger_coaching_handler.alert_queue = SqsAlertQueue('local://coaching-alerts', sqs) if alerts else None
+    alert_digest_handler.sink = sink
+    alert_digest_handler.last_sent = {}
+    alert_dispatcher.MIN_SEND_INTERVAL_SECONDS = args.alert_min_interval
+
+    seed_history(s3, rng, args.seed_days, args.seed_per_day, agents)
+    seed_flat_keys(s3, rng, args.legacy_flat_keys, args.seed_days, agents)
+
+    stop = threading.Event()
+    results = Results()
+    threads = [threading.Thread(target=ingest_worker, args=(stop, s3, counter, results))
+               for _ in range(args.ingest_workers)]
+    if args.legacy_flat_keys:
+        threads.append(threading.Thread(target=backfill_partitions, args=(s3, BUCKET)))
+    if alerts:
+        threads.append(threading.Thread(target=alert_consumer,
+                                        args=(stop, sqs, counter, results, args.alert_batch_window)))
+    if args.arrival_rate > 0:
+        threads.append(threading.Thread(target=pca_writer, args=(stop, s3, args.arrival_rate, agents, args.seed)))
+    threads += [
+        threading.Thread(target=dashboard_client,
+                         args=(stop, pool, counter, results, parse_windows(args.window_hours), args.think_ms, args.seed + i + 1))
+        for i in range(args.clients)
+    ]
+
+    log = sys.stdout if args.verbose else io.StringIO()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(log):
+        for thread in threads:
+            thread.start()
+        time.sleep(args.duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    elapsed = time.perf_counter() - started
+    s3_trigger_coaching_handler.alert_queue = None
+
+    return {
+        'config': {
+            'clients': args.clients,
+            'containers': pool.created,
+            'durationSecs': round(elapsed, 2),
+            'arrivalRatePerSec': args.arrival_rate,
+            'windowHours': args.window_hours,
+            'cacheMinutes': args.cache_minutes,
+            'seededTranscripts': args.seed_days * args.seed_per_day,
+            'legacyFlatKeys': args.legacy_flat_keys
+        },
+        'analytics': summarise(results.samples['analytics']),
+        'ingest': summarise(results.samples['ingest']),
+        'ingestCopy': summarise(results.samples['ingestCopy']),
+        'ingestBackfillSkip': summarise(results.samples['ingestBackfillSkip']),
+        'alertDigest': summarise(results.samples['alertDigest']),
+        'totalCalls': dict(sorted(counter.totals.items())),
+        'alerts': {
+            'queued': sqs.sent,
+            'digestsSent': sink.digests,
+            'alertsDelivered': sink.alerts,
+            'pendingAtEnd': len(sqs.messages)
+        } if alerts else None
+    }
+
+
+def print_report(report, violations):
+    config = report['config']
+    print(f"📊 {config['clients']} clients on {config['containers']} containers for {config['durationSecs']}s, "
+          f"{config['arrivalRatePerSec']} transcripts/s, {config['seededTranscripts']} seeded transcripts")
+    labels = {
+        'analytics': 'analytics',
+        'ingest': 'ingest (analysis)',
+        'ingestCopy': 'ingest (flat-key copy only)',
+        'ingestBackfillSkip': 'ingest (backfill copy skipped)',
+        'alertDigest': 'alert digest consumer'
+    }
+    for workload, label in labels.items():
+        stats = report[workload]
+        if workload != 'analytics' and not stats['requests']:
+            continue
+        print(f"\n{label}: {stats['requests']} requests, error rate {stats['errorRate']:.2%}")
+        print(f"  latency p50={stats['p50Ms']}ms p95={stats['p95Ms']}ms "
+              f"p99={stats['p99Ms']}ms max={stats['maxMs']}ms")
+        if workload == 'analytics':
+            print(f"  cache hit ratio {stats['cacheHitRatio']:.2%}, {stats['coldStarts']} cold starts")
+        for name, per_request in stats['callsPerRequest'].items():
+            print(f"  {name}: {per_request}/request")
+
+    if 'ingestWithAlerts' in report:
+        off, on = report['ingest'], report['ingestWithAlerts']
+        print(f"\ningest (analysis) latency, alerting off vs on: p50 {off['p50Ms']} vs {on['p50Ms']}ms, "
+              f"p95 {off['p95Ms']} vs {on['p95Ms']}ms, p99 {off['p99Ms']} vs {on['p99Ms']}ms")
+        print(f"  sqs.SendMessageBatch/request with alerting on: "
+              f"{on['callsPerRequest'].get('sqs.SendMessageBatch', 0)}")
+        print(f"  alerts: {report['alerts']}")
+
+    if violations:
+        print("\n❌ SLO violations:")
+        for violation in violations:
+            print(f"  - {violation}")
+    else:
+        print("\n✅ All SLOs met")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=100, help='Concurrent dashboard clients')
+    parser.add_argument('--containers', type=int,
+                        help='Max analytics containers (default: unlimited, one per concurrent request)')
+    parser.add_argument('--duration', type=float, default=10.0, help='Run time in seconds')
+    parser.add_argument('--think-ms', type=float, default=50.0, help='Mean pause between polls per client')
+    parser.add_argument('--window-hours', default='24',
+                        help="windowHours per request: '24', or weighted choices like '1:0.5,24:0.3,168:0.2'")
+    parser.add_argument('--cache-minutes', type=float, default=coaching_analytics_handler.CACHE_DURATION_MINUTES,
+                        help='Override the analytics cache duration')
+    parser.add_argument('--arrival-rate', type=float, default=2.0, help='New PCA transcripts per second')
+    parser.add_argument('--ingest-workers', type=int, default=4, help='Concurrent trigger invocations')
+    parser.add_argument('--agents', type=int, default=25)
+    parser.add_argument('--seed-days', type=int, default=30, help='Days of history to preload')
+    parser.add_argument('--seed-per-day', type=int, default=50, help='Transcripts per preloaded day')
+    parser.add_argument('--legacy-flat-keys', type=int, default=0,
+                        help='Flat parsedFiles/*.json keys to preload and migrate with backfill_partitions during the run')
+    parser.add_argument('--s3-latency-ms', type=float, default=0.0, help='Simulated latency per S3 call')
+    parser.add_argument('--dynamodb-latency-ms', type=float, default=0.0, help='Simulated latency per DynamoDB call')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--alerts', action='store_true',
+                        help='Run again with alerting on and compare ingest latency')
+    parser.add_argument('--alerts-file', default=os.path.join(tempfile.gettempdir(), 'coaching-alerts-loadtest.jsonl'),
+                        help='FileSink path for alert digests with --alerts')
+    parser.add_argument('--sqs-latency-ms', type=float, default=0.0, help='Simulated latency per SQS call')
+    parser.add_argument('--alert-batch-window', type=float, default=1.0,
+                        help='Seconds between alert consumer invocations (SQS batching window)')
+    parser.add_argument('--alert-min-interval', type=float, default=5.0,
+                        help='MIN_SEND_INTERVAL_SECONDS and visibility timeout for the run')
+    parser.add_argument('--slo-p50-ms', type=float)
+    parser.add_argument('--slo-p95-ms', type=float)
+    parser.add_argument('--slo-p99-ms', type=float)
+    parser.add_argument('--slo-max-error-rate', type=float)
+    parser.add_argument('--slo-min-hit-ratio', type=float)
+    parser.add_argument('--slo-max-s3-calls', type=float, help='Max S3 calls per analytics request')
+    parser.add_argument('--slo-ingest-p95-ms', type=float, help='Max p95 of analysis ingest invocations')
+    parser.add_argument('--slo-ingest-p99-ms', type=float, help='Max p99 of analysis ingest invocations')
+    parser.add_argument('--slo-ingest-max-error-rate', type=float)
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    parser.add_argument('--verbose', action='store_true', help='Keep handler log output')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run(args)
+    if args.alerts:
+        with_alerts = run(args, alerts=True)
+        report['ingestWithAlerts'] = with_alerts['ingest']
+        report['alertDigest'] = with_alerts['alertDigest']
+        report['alerts'] = with_alerts['alerts']
+    violations = check_slos(report, args)
+    report['sloViolations'] = violations
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, violations)
+    return 1 if violations else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
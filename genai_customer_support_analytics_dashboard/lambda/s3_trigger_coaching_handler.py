@@ -1,13 +1,28 @@
 import boto3
 import json
-from datetime import datetime
+from botocore.config import Config
+from datetime import datetime, timezone
+
+from alert_dispatcher import SqsAlertQueue
+from transcript_partitions import copy_to_partition, is_backfill_copy, is_flat_key
 
 s3 = boto3.client('s3')
 dynamodb = boto3.resource('dynamodb')
+# Alert hand-off is on the ingest path: fail fast rather than wait on boto3's 60s defaults
+sqs = boto3.client('sqs', config=Config(
+    connect_timeout=1,
+    read_timeout=2,
+    retries={'max_attempts': 2, 'mode': 'standard'}
+))
 
 # Configuration - UPDATE THESE
 COACHING_TABLE_NAME = 'coaching-insights'  # DynamoDB table for storing insights
 PROCESSED_BUCKET = 'coaching-processed-transcripts'  # Optional: track processed files
+ALERTS_ENABLED = False  # Queue high-priority insights for alert_digest_handler
+ALERT_QUEUE_URL = ''  # SQS queue consumed by alert_digest_handler
+
+# Alerts are handed off to SQS; coalescing and delivery happen in alert_digest_handler
+alert_queue = SqsAlertQueue(ALERT_QUEUE_URL, sqs) if ALERTS_ENABLED else None
 
 def lambda_handler(event, context):
     """
@@ -22,6 +37,11 @@ def lambda_handler(event, context):
             }
         }]
     }
+
+    Flat keys written by PCA are copied into their day partition; the copy
+    raises its own event and is analysed then, so each transcript is only
+    processed once. If the copy fails the flat key is analysed directly.
+    Backfill copies of already-analysed transcripts are skipped.
     """
     try:
         # Process each S3 event record
@@ -36,9 +56,29 @@ def lambda_handler(event, context):
                 print(f"⏭️  Skipping non-transcript file: {key}")
                 continue
             
+            # Analytics only reads parsedFiles/YYYY/MM/DD/, so flat keys are always mirrored
+            if is_flat_key(key):
+                try:
+                    event_time = record.get('eventTime', datetime.now(timezone.utc).isoformat())
+                    partitioned_key = copy_to_partition(s3, bucket, key, event_time)
+                    print(f"📂 Mirrored {key} -> {partitioned_key}")
+                    continue
+                except Exception as e:
+                    print(f"❌ Error partitioning transcript, analysing flat key instead: {str(e)}")
+                    print(f"⚠️ {key} is missing from analytics until backfill_partitions is re-run")
+            
             # Get the transcript from S3
             try:
                 response = s3.get_object(Bucket=bucket, Key=key)
+            except Exception as e:
+                print(f"❌ Error reading transcript from S3: {str(e)}")
+                continue
+            
+            if is_backfill_copy(response):
+                print(f"⏭️  Skipping backfill copy (already analysed): {key}")
+                continue
+            
+            try:
                 transcript_data = json.loads(response['Body'].read())
             except Exception as e:
                 print(f"❌ Error reading transcript from S3: {str(e)}")
@@ -57,7 +97,7 @@ def lambda_handler(event, context):
                 high_priority = [i for i in insights if i.get('priority') == 'high']
                 if high_priority:
                     print(f"🚨 Found {len(high_priority)} high-priority insights")
-                    # TODO: Send SNS notification or webhook
+                    send_notification(high_priority)
             else:
                 print(f"ℹ️  No insights generated for {key}")
         
@@ -292,6 +332,11 @@ def store_insights(insights, transcript_key):
 
 
 def send_notification(insights):
-    """Send notification for high-priority insights (optional)"""
-    # TODO: Implement SNS, SES, or webhook notification
-    pass
+    """Hand high-priority insights off to the alert queue (after they are stored)"""
+    if alert_queue is None:
+        return 0
+    
+    queued = alert_queue.submit(insights)
+    if queued < len(insights):
+        print(f"⚠️ Failed to queue {len(insights) - queued} alerts")
+    return queued
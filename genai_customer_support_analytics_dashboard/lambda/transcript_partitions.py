@@ -0,0 +1,187 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+# Configuration - UPDATE THESE
+PARSED_PREFIX = 'parsedFiles/'
+LIST_WORKERS = 8  # Partitions listed concurrently
+BACKFILL_METADATA_KEY = 'coaching-backfill'  # Set on backfill copies so the S3 trigger skips them
+
+# Partitioned keys look like parsedFiles/YYYY/MM/DD/<file>.json
+PARTITION_PATTERN = re.compile(r'^parsedFiles/(\d{4})/(\d{2})/(\d{2})/[^/]+$')
+
+
+def is_partitioned_key(key):
+    """Return True if the key already uses the parsedFiles/YYYY/MM/DD/ layout"""
+    return PARTITION_PATTERN.match(key) is not None
+
+
+def is_flat_key(key):
+    """Return True for legacy keys stored directly under parsedFiles/"""
+    return key.startswith(PARSED_PREFIX) and '/' not in key[len(PARSED_PREFIX):]
+
+
+def partition_prefix(day):
+    """Return the listing prefix for a single day partition"""
+    return f"{PARSED_PREFIX}{day.year:04d}/{day.month:02d}/{day.day:02d}/"
+
+
+def partition_date(key):
+    """Return the partition date encoded in a partitioned key, or None for flat keys"""
+    match = PARTITION_PATTERN.match(key)
+    if not match:
+        return None
+    year, month, day = (int(part) for part in match.groups())
+    return datetime(year, month, day, tzinfo=timezone.utc).date()
+
+
+def to_partitioned_key(key, when):
+    """
+    Map a flat key to its partitioned location
+
+    parsedFiles/call-123.json + 2025-10-31T12:00Z -> parsedFiles/2025/10/31/call-123.json
+    Keys that are already partitioned are returned unchanged.
+    """
+    if is_partitioned_key(key):
+        return key
+    if not is_flat_key(key):
+        raise ValueError(f"Not a parsedFiles/ transcript key: {key}")
+    return partition_prefix(to_utc(when)) + key[len(PARSED_PREFIX):]
+
+
+def to_utc(when):
+    """Normalise a datetime or ISO-8601 string to an aware UTC datetime"""
+    if isinstance(when, str):
+        when = datetime.fromisoformat(when.replace('Z', '+00:00'))
+    if when.tzinfo is None:
+        return when.replace(tzinfo=timezone.utc)
+    return when.astimezone(timezone.utc)
+
+
+def partition_prefixes(start, end):
+    """Return the day-partition prefixes overlapping [start, end]"""
+    start_day = to_utc(start).date()
+    end_day = to_utc(end).date()
+
+    prefixes = []
+    day = start_day
+    while day <= end_day:
+        prefixes.append(partition_prefix(day))
+        day += timedelta(days=1)
+    return prefixes
+
+
+def object_time(obj):
+    """
+    Best-known time of a listed transcript object
+
+    LastModified, clamped to the end of the object's day partition so that
+    transcripts copied into an older partition (e.g. by the backfill) are not
+    mistaken for recent calls.
+    """
+    modified = to_utc(obj['LastModified'])
+    day = partition_date(obj['Key'])
+    if day is None:
+        return modified
+    day_end = datetime(day.year, day.month, day.day, tzinfo=timezone.utc) + timedelta(days=1)
+    return min(modified, day_end - timedelta(microseconds=1))
+
+
+def list_partition(s3, bucket, prefix):
+    """List every object under one partition prefix"""
+    objects = []
+    paginator = s3.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        objects.extend(page.get('Contents', []))
+    return objects
+
+
+def list_window(s3, bucket, start, end, max_workers=LIST_WORKERS):
+    """
+    List transcript objects whose time falls inside [start, end]
+
+    Only the day partitions overlapping the window are listed, in parallel, so
+    the cost depends on the window size rather than on the bucket's history.
+    Objects from the edge partitions are then filtered to the window.
+    Objects are returned newest first.
+    """
+    start, end = to_utc(start), to_utc(end)
+    prefixes = partition_prefixes(start, end)
+    if not prefixes:
+        return []
+
+    workers = max(1, min(max_workers, len(prefixes)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda prefix: list_partition(s3, bucket, prefix), prefixes)
+
+    objects = [
+        obj for partition in results for obj in partition
+        if start <= object_time(obj) <= end
+    ]
+    return sorted(objects, key=object_time, reverse=True)
+
+
+def copy_to_partition(s3, bucket, key, when, metadata=None):
+    """
+    Copy a flat transcript into its day partition and return the new key
+
+    If metadata is given it replaces the source object's metadata on the copy.
+    """
+    target_key = to_partitioned_key(key, when)
+    if target_key == key:
+        return target_key
+
+    params = {
+        'Bucket': bucket,
+        'Key': target_key,
+        'CopySource': {'Bucket': bucket, 'Key': key}
+    }
+    if metadata:
+        params.update({
+            'Metadata': metadata,
+            'MetadataDirective': 'REPLACE',
+            'ContentType': 'application/json'
+        })
+    s3.copy_object(**params)
+    return target_key
+
+
+def is_backfill_copy(s3_object):
+    """Return True if a get_object/head_object response is a backfill copy"""
+    return s3_object.get('Metadata', {}).get(BACKFILL_METADATA_KEY) == 'true'
+
+
+def backfill_partitions(s3, bucket, dry_run=False):
+    """
+    One-off migration of legacy flat keys into day partitions
+
+    Each flat object is copied to the partition of its LastModified date.
+    Keys whose partitioned copy already exists are skipped, so the backfill
+    can be re-run safely. Copies are tagged with BACKFILL_METADATA_KEY: they
+    still raise S3 ObjectCreated events, but the trigger does not re-analyse
+    them because they were already analysed under their flat keys.
+    """
+    copied = []
+    existing = {}  # partition prefix -> keys already in that partition
+    paginator = s3.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=PARSED_PREFIX, Delimiter='/'):
+        for obj in page.get('Contents', []):
+            key = obj['Key']
+            if not key.endswith('.json') or not is_flat_key(key):
+                continue
+
+            prefix = partition_prefix(to_utc(obj['LastModified']))
+            if prefix not in existing:
+                existing[prefix] = {o['Key'] for o in list_partition(s3, bucket, prefix)}
+
+            target_key = to_partitioned_key(key, obj['LastModified'])
+            if target_key in existing[prefix]:
+                continue
+            if not dry_run:
+                copy_to_partition(s3, bucket, key, obj['LastModified'],
+                                  metadata={BACKFILL_METADATA_KEY: 'true'})
+                existing[prefix].add(target_key)
+            copied.append((key, target_key))
+
+    print(f"✅ Backfilled {len(copied)} flat transcripts into day partitions")
+    return copied